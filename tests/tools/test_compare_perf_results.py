@@ -0,0 +1,23 @@
+"""Report parsing tests for tools/compare_perf_results.py"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'tools'))
+
+from compare_perf_results import parse_markdown_report
+
+REPORT = """\
+| Test | Interval | Sent | Received | Failures | Success Rate | Throughput | Memory |
+|------|----------|------|----------|----------|--------------|------------|--------|
+| TCP_1t1c100_i1,b | 1ms | 1,000 | 990 | 10 | 99.0% | 12,889,173 | 13.5 |
+"""
+
+
+def test_thousands_separators_only_dropped_from_numbers(tmp_path):
+    path = tmp_path / 'report.md'
+    path.write_text(REPORT)
+    [result] = parse_markdown_report(str(path))
+    assert result.name == 'TCP_1t1c100_i1,b'
+    assert (result.sent, result.received, result.failures) == (1000, 990, 10)
+    assert result.throughput == 12889173
@@ -0,0 +1,98 @@
+"""Schema parsing tests for tools/uvrpcc.py"""
+
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parents[2] / 'tools'
+sys.path.insert(0, str(TOOLS_DIR))
+
+from uvrpcc import RPCGenerator, RPCParser
+
+INT32_X = {'name': 'x', 'type': 'int32_t', 'original_type': 'int32', 'is_array': False}
+STRING_Y = {'name': 'y', 'type': 'const char*', 'original_type': 'string', 'is_array': False}
+
+
+def parse(tmp_path, schema):
+    path = tmp_path / 'schema.fbs'
+    path.write_text(schema)
+    return RPCParser(str(path)).parse()
+
+
+def method(name, request, response, fields):
+    return {
+        'name': name,
+        'return': response,
+        'request': request,
+        'response': response,
+        'request_fields': fields,
+    }
+
+
+@pytest.mark.parametrize('schema', [
+    "table T {x:int32;\n y:string;}\n",
+    "table T { x: int32;\n  y: string;\n}\n",
+    "table T\n{\n  x: int32;\n  y: string;\n}\n",
+])
+def test_table_fields_after_header_brace(tmp_path, schema):
+    assert parse(tmp_path, schema)['tables'] == {'T': [INT32_X, STRING_Y]}
+
+
+@pytest.mark.parametrize('schema', [
+    "namespace A; table T { x: int32; } rpc_service S { Do(T):T; }\n",
+    "namespace A;\ntable T { x: int32; }\nrpc_service S { Do(T):T;\n}\n",
+    "namespace A;\ntable T {x: int32;\n}\nrpc_service S\n{\n  Do(T):T;\n}\n",
+])
+def test_statements_sharing_a_line(tmp_path, schema):
+    rpc_data = parse(tmp_path, schema)
+    assert rpc_data['namespace'] == 'A'
+    assert rpc_data['tables'] == {'T': [INT32_X]}
+    assert [(s['name'], s['methods']) for s in rpc_data['services']] == [
+        ('S', [method('Do', 'T', 'T', [INT32_X])]),
+    ]
+
+
+def test_utf8_byte_order_mark(tmp_path):
+    path = tmp_path / 'schema.fbs'
+    path.write_bytes(b'\xef\xbb\xbfnamespace rpc;\ntable T { x: int32; }\n')
+    rpc_data = RPCParser(str(path)).parse()
+    assert rpc_data['namespace'] == 'rpc'
+    assert rpc_data['tables'] == {'T': [INT32_X]}
+
+
+def test_service_methods_after_header_brace(tmp_path):
+    rpc_data = parse(tmp_path, "table T { x: int32; }\nrpc_service S { Do(T):T;\n  Undo(T):T; }\n")
+    assert [m['name'] for m in rpc_data['services'][0]['methods']] == ['Do', 'Undo']
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='needs POSIX FIFOs')
+def test_schema_from_fifo(tmp_path):
+    fifo = tmp_path / 'schema.fbs'
+    os.mkfifo(fifo)
+    writer = threading.Thread(target=fifo.write_text, args=("table T { x: int32; }\n",))
+    writer.start()
+    try:
+        assert RPCParser(str(fifo)).parse()['tables'] == {'T': [INT32_X]}
+    finally:
+        writer.join()
+
+
+def test_rpc_schema_needs_only_rpc_templates(tmp_path):
+    pytest.importorskip('jinja2')
+    template_dir = tmp_path / 'templates'
+    template_dir.mkdir()
+    for name in ('api.h', 'rpc_common.h', 'server_stub.c', 'client.c', 'rpc_common.c'):
+        shutil.copy(TOOLS_DIR / 'templates' / f'{name}.j2', template_dir)
+
+    rpc_data = parse(tmp_path, "namespace A;\ntable T { x: int32; }\nrpc_service S { Do(T):T; }\n")
+    (tmp_path / 'out').mkdir()
+    generator = RPCGenerator(tmp_path / 'out', template_dir)
+    generator.generate_all(rpc_data)
+    generator.flush()
+    assert sorted(Path(path).name for path in generator.generated) == [
+        'a_s_api.h', 'a_s_client.c', 'a_s_rpc_common.c', 'a_s_rpc_common.h', 'a_s_server_stub.c',
+    ]
@@ -9,14 +9,39 @@ comprehensive comparison charts and tables.
 import os
 import re
 import sys
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 import argparse
+from operator import attrgetter
+
+# Parsing runs at about 14 MB/s, but a worker also has to pickle its results
+# back (about 55% of the parse time again) and a pool costs about 8 ms to
+# start. Worker processes only pay off for at least four reports totalling a
+# few hundred KB each.
+_PARALLEL_PARSE_MIN_REPORTS = 4
+_PARALLEL_PARSE_MIN_BYTES = 1 << 20
+
+# Test name prefix -> transport
+_PREFIX_MAP = {'TCP_': 'TCP', 'UDP_': 'UDP', 'IPC_': 'IPC'}
+
+# Test name configuration, e.g. TCP_2t2c100_i2
+_CONFIG_RE = re.compile(r'(\d+)t(\d+)c(\d+)_i(\d+)')
+
+# Transport table row: Test Name | Threads | Clients | Interval | Sent | Received | Success Rate | Throughput | Memory
+_ROW_FMT = '| {} | {} | {} | {}ms | {:,} | {:,} | {:.1f}% | {:,.0f} | {:.0f} |\n'
+_ROW_FIELDS = attrgetter('name', 'threads', 'clients', 'interval', 'sent', 'received',
+                         'success_rate', 'throughput', 'memory')
 
 class PerformanceResult:
     """Represents a single performance test result."""
     
+    __slots__ = ('name', 'transport', 'threads', 'clients', 'concurrency', 'interval',
+                 'sent', 'received', 'failures', 'success_rate', 'throughput', 'memory')
+    
     def __init__(self, name: str, transport: str, threads: int, clients: int,
                  concurrency: int, interval: int, sent: int, received: int,
                  failures: int, success_rate: str, throughput: str, memory: str):
@@ -48,135 +73,100 @@ def parse_markdown_report(file_path: str) -> List[PerformanceResult]:
     """Parse a markdown performance report and extract results."""
     results = []
     
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    # Extract table rows
-    # Pattern: | Test | Interval | Sent | Received | Failures | Success Rate | Throughput | Memory |
-    table_pattern = r'\| ([^|]+) \| ([^|]+)ms \| ([\d,]+) \| ([\d,]+) \| ([\d,]+) \| ([\d.]+)% \| ([\d,]+) \| ([\d.]+) \|'
-    
-    for match in re.finditer(table_pattern, content):
-        name = match.group(1)
-        interval = int(match.group(2))
-        sent = int(match.group(3).replace(',', ''))
-        received = int(match.group(4).replace(',', ''))
-        failures = int(match.group(5).replace(',', ''))
-        success_rate = match.group(6)
-        throughput = float(match.group(7).replace(',', ''))
-        memory = float(match.group(8))
-        
-        # Parse transport and configuration from name
-        if name.startswith('TCP_'):
-            transport = 'TCP'
-        elif name.startswith('UDP_'):
-            transport = 'UDP'
-        elif name.startswith('IPC_'):
-            transport = 'IPC'
-        else:
-            continue
-        
-        # Parse threads and clients from name
-        # Pattern: TCP_2t2c100_i2
-        config_match = re.search(r'(\d+)t(\d+)c(\d+)_i(\d+)', name)
-        if config_match:
-            threads = int(config_match.group(1))
-            clients = int(config_match.group(2))
-            concurrency = int(config_match.group(3))
-            interval_config = int(config_match.group(4))
-        else:
-            threads = 1
-            clients = 1
-            concurrency = 100
-            interval_config = interval
-        
-        result = PerformanceResult(
-            name, transport, threads, clients, concurrency, interval,
-            sent, received, failures, success_rate, throughput, memory
-        )
-        results.append(result)
+    with open(file_path, 'r', buffering=1 << 16) as f:
+        for line in f:
+            # Extract table rows, rejecting everything else cheaply
+            # Row: | Test | Interval | Sent | Received | Failures | Success Rate | Throughput | Memory |
+            if not line.startswith('| '):
+                continue
+            parts = [p.strip() for p in line.strip().strip('|').split('|')]
+            if len(parts) != 8 or not parts[1].endswith('ms') or not parts[5].endswith('%'):
+                continue
+            
+            name = parts[0]
+            
+            # Parse transport and configuration from name
+            transport = _PREFIX_MAP.get(name[:4])
+            if transport is None:
+                continue
+            
+            # Drop thousands separators from the numeric cells only; the test
+            # name is kept exactly as written in the report
+            numbers = [p.replace(',', '') for p in parts[1:]]
+            try:
+                interval = int(numbers[0].rstrip('ms'))
+                sent = int(numbers[1])
+                received = int(numbers[2])
+                failures = int(numbers[3])
+                success_rate = numbers[4]
+                throughput = float(numbers[5])
+                memory = float(numbers[6])
+            except ValueError:
+                # Not a results row (e.g. a different table)
+                continue
+            
+            # Parse threads and clients from name
+            # Pattern: TCP_2t2c100_i2
+            config_match = _CONFIG_RE.search(name)
+            if config_match:
+                threads = int(config_match.group(1))
+                clients = int(config_match.group(2))
+                concurrency = int(config_match.group(3))
+                interval_config = int(config_match.group(4))
+            else:
+                threads = 1
+                clients = 1
+                concurrency = 100
+                interval_config = interval
+            
+            try:
+                result = PerformanceResult(
+                    name, transport, threads, clients, concurrency, interval,
+                    sent, received, failures, success_rate, throughput, memory
+                )
+            except ValueError:
+                continue
+            results.append(result)
     
     return results
 
-def compare_results(results_list: List[Tuple[str, List[PerformanceResult]]]) -> str:
-    """Compare multiple test runs and generate comparison report."""
-    
-    report = f"""# UVRPC Performance Comparison Report
+def _new_columns() -> Tuple[array, array, array]:
+    """Create parallel double-precision throughput, success rate and memory columns."""
+    return array('d'), array('d'), array('d')
+
+# Report sections; only the header and best-of rows carry dynamic values
+_HEADER = """# UVRPC Performance Comparison Report
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
-**Number of Reports:** {len(results_list)}
+**Generated:** %(ts)s  
+**Number of Reports:** %(n)d
 
 ---
 
 ## Summary
 
-"""
-    
-    # Find best results by category
-    best_throughput = None
-    best_success_rate = None
-    best_memory = None
-    
-    for report_name, results in results_list:
-        for result in results:
-            if best_throughput is None or result.throughput > best_throughput.throughput:
-                best_throughput = result
-            if best_success_rate is None or result.success_rate > best_success_rate.success_rate:
-                best_success_rate = result
-            if best_memory is None or result.memory < best_memory.memory:
-                best_memory = result
-    
-    report += f"""
+
 ### Best Performance
 
 | Metric | Test | Value | Configuration |
 |--------|------|-------|---------------|
-| **Max Throughput** | {best_throughput.name} | {best_throughput.throughput:,.0f} ops/s | {best_throughput.threads}t, {best_throughput.clients}c, {best_throughput.interval}ms |
-| **Best Success Rate** | {best_success_rate.name} | {best_success_rate.success_rate:.1f}% | {best_success_rate.threads}t, {best_success_rate.clients}c, {best_success_rate.interval}ms |
-| **Best Memory** | {best_memory.name} | {best_memory.memory:.0f} MB | {best_memory.threads}t, {best_memory.clients}c, {best_memory.interval}ms |
+"""
+
+_BEST_ROW = "| **%s** | %s | %s | %dt, %dc, %dms |\n"
 
+_TRANSPORT_HEADER = """
 ---
 
 ## Transport Comparison
-
-### TCP Transport
-
-| Test Name | Threads | Clients | Interval | Sent | Received | Success Rate | Throughput | Memory |
-|-----------|---------|---------|----------|------|----------|--------------|------------|--------|
 """
-    
-    # TCP results
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'TCP':
-                report += f"| {result.name} | {result.threads} | {result.clients} | {result.interval}ms | {result.sent:,} | {result.received:,} | {result.success_rate:.1f}% | {result.throughput:,.0f} | {result.memory:.0f} |\n"
-    
-    report += f"""
-### UDP Transport
 
-| Test Name | Threads | Clients | Interval | Sent | Received | Success Rate | Throughput | Memory |
-|-----------|---------|---------|----------|------|----------|--------------|------------|--------|
-"""
-    
-    # UDP results
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'UDP':
-                report += f"| {result.name} | {result.threads} | {result.clients} | {result.interval}ms | {result.sent:,} | {result.received:,} | {result.success_rate:.1f}% | {result.throughput:,.0f} | {result.memory:.0f} |\n"
-    
-    report += f"""
-### IPC Transport
+_TRANSPORT_TABLE_HEADER = """
+### %s Transport
 
 | Test Name | Threads | Clients | Interval | Sent | Received | Success Rate | Throughput | Memory |
 |-----------|---------|---------|----------|------|----------|--------------|------------|--------|
 """
-    
-    # IPC results
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'IPC':
-                report += f"| {result.name} | {result.threads} | {result.clients} | {result.interval}ms | {result.sent:,} | {result.received:,} | {result.success_rate:.1f}% | {result.throughput:,.0f} | {result.memory:.0f} |\n"
-    
-    report += f"""
+
+_INTERVAL_HEADER = """
 
 ---
 
@@ -187,55 +177,15 @@ def compare_results(results_list: List[Tuple[str, List[PerformanceResult]]]) ->
 | Interval | Avg Throughput | Avg Success Rate | Avg Memory | Notes |
 |----------|----------------|-------------------|------------|-------|
 """
-    
-    # Group TCP results by interval
-    tcp_by_interval = {}
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'TCP':
-                if result.interval not in tcp_by_interval:
-                    tcp_by_interval[result.interval] = []
-                tcp_by_interval[result.interval].append(result)
-    
-    for interval in sorted(tcp_by_interval.keys()):
-        results = tcp_by_interval[interval]
-        avg_throughput = sum(r.throughput for r in results) / len(results)
-        avg_success = sum(r.success_rate for r in results) / len(results)
-        avg_memory = sum(r.memory for r in results) / len(results)
-        
-        if interval == 1:
-            notes = "Highest throughput, lower success rate"
-        elif interval == 2:
-            notes = "**Recommended** - Best balance"
-        else:
-            notes = "Highest success rate, lower throughput"
-        
-        report += f"| {interval}ms | {avg_throughput:,.0f} | {avg_success:.1f}% | {avg_memory:.0f} | {notes} |\n"
-    
-    report += f"""
+
+_UDP_INTERVAL_HEADER = """
 ### UDP Transport by Interval
 
 | Interval | Avg Throughput | Avg Success Rate | Avg Memory |
 |----------|----------------|-------------------|------------|
 """
-    
-    # Group UDP results by interval
-    udp_by_interval = {}
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'UDP':
-                if result.interval not in udp_by_interval:
-                    udp_by_interval[result.interval] = []
-                udp_by_interval[result.interval].append(result)
-    
-    for interval in sorted(udp_by_interval.keys()):
-        results = udp_by_interval[interval]
-        avg_throughput = sum(r.throughput for r in results) / len(results)
-        avg_success = sum(r.success_rate for r in results) / len(results)
-        avg_memory = sum(r.memory for r in results) / len(results)
-        report += f"| {interval}ms | {avg_throughput:,.0f} | {avg_success:.1f}% | {avg_memory:.0f} |\n"
-    
-    report += f"""
+
+_SCALABILITY_HEADER = """
 
 ---
 
@@ -246,30 +196,8 @@ def compare_results(results_list: List[Tuple[str, List[PerformanceResult]]]) ->
 | Threads | Avg Throughput (TCP) | Avg Throughput (UDP) | Notes |
 |---------|---------------------|---------------------|-------|
 """
-    
-    # Group by thread count
-    tcp_by_threads = {}
-    udp_by_threads = {}
-    
-    for report_name, results in results_list:
-        for result in results:
-            if result.transport == 'TCP':
-                if result.threads not in tcp_by_threads:
-                    tcp_by_threads[result.threads] = []
-                tcp_by_threads[result.threads].append(result)
-            elif result.transport == 'UDP':
-                if result.threads not in udp_by_threads:
-                    udp_by_threads[result.threads] = []
-                udp_by_threads[result.threads].append(result)
-    
-    all_threads = sorted(set(tcp_by_threads.keys()) | set(udp_by_threads.keys()))
-    
-    for threads in all_threads:
-        tcp_avg = sum(r.throughput for r in tcp_by_threads.get(threads, [])) / len(tcp_by_threads.get(threads, [1])) if threads in tcp_by_threads else 0
-        udp_avg = sum(r.throughput for r in udp_by_threads.get(threads, [])) / len(udp_by_threads.get(threads, [1])) if threads in udp_by_threads else 0
-        report += f"| {threads} | {tcp_avg:,.0f} | {udp_avg:,.0f} |\n"
-    
-    report += f"""
+
+_FOOTER = """
 
 ---
 
@@ -297,8 +225,88 @@ Based on the analysis:
 **Generated by:** UVRPC Performance Comparison Tool  
 **Version:** 1.0
 """
+
+def compare_results(results_list: List[Tuple[str, List[PerformanceResult]]]) -> str:
+    """Compare multiple test runs and generate comparison report."""
+    
+    parts = [_HEADER % {'ts': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'n': len(results_list)}]
     
-    return report
+    # Single pass: bucket results by transport and collect metric columns
+    # per (transport, interval) and (transport, threads) for the averages below
+    all_results = [result for report_name, results in results_list for result in results]
+    by_transport = defaultdict(list)
+    by_tp_interval = defaultdict(_new_columns)
+    by_tp_threads = defaultdict(lambda: array('d'))
+    
+    for result in all_results:
+        by_transport[result.transport].append(result)
+        throughput, success, memory = by_tp_interval[(result.transport, result.interval)]
+        throughput.append(result.throughput)
+        success.append(result.success_rate)
+        memory.append(result.memory)
+        by_tp_threads[(result.transport, result.threads)].append(result.throughput)
+    
+    # Find best results by category
+    best_throughput = max(all_results, key=attrgetter('throughput'))
+    best_success_rate = max(all_results, key=attrgetter('success_rate'))
+    best_memory = min(all_results, key=attrgetter('memory'))
+    
+    for label, best, value in (
+        ('Max Throughput', best_throughput, f"{best_throughput.throughput:,.0f} ops/s"),
+        ('Best Success Rate', best_success_rate, f"{best_success_rate.success_rate:.1f}%"),
+        ('Best Memory', best_memory, f"{best_memory.memory:.0f} MB"),
+    ):
+        parts.append(_BEST_ROW % (label, best.name, value, best.threads, best.clients, best.interval))
+    
+    # Per-transport results
+    parts.append(_TRANSPORT_HEADER)
+    for transport in ('TCP', 'UDP', 'IPC'):
+        parts.append(_TRANSPORT_TABLE_HEADER % transport)
+        parts.extend(_ROW_FMT.format(*_ROW_FIELDS(result)) for result in by_transport[transport])
+    
+    parts.append(_INTERVAL_HEADER)
+    
+    # TCP results by interval
+    for interval in sorted(iv for tp, iv in by_tp_interval if tp == 'TCP'):
+        throughput, success, memory = by_tp_interval[('TCP', interval)]
+        avg_throughput = sum(throughput) / len(throughput)
+        avg_success = sum(success) / len(success)
+        avg_memory = sum(memory) / len(memory)
+        
+        if interval == 1:
+            notes = "Highest throughput, lower success rate"
+        elif interval == 2:
+            notes = "**Recommended** - Best balance"
+        else:
+            notes = "Highest success rate, lower throughput"
+        
+        parts.append(f"| {interval}ms | {avg_throughput:,.0f} | {avg_success:.1f}% | {avg_memory:.0f} | {notes} |\n")
+    
+    parts.append(_UDP_INTERVAL_HEADER)
+    
+    # UDP results by interval
+    for interval in sorted(iv for tp, iv in by_tp_interval if tp == 'UDP'):
+        throughput, success, memory = by_tp_interval[('UDP', interval)]
+        avg_throughput = sum(throughput) / len(throughput)
+        avg_success = sum(success) / len(success)
+        avg_memory = sum(memory) / len(memory)
+        parts.append(f"| {interval}ms | {avg_throughput:,.0f} | {avg_success:.1f}% | {avg_memory:.0f} |\n")
+    
+    parts.append(_SCALABILITY_HEADER)
+    
+    # Throughput by thread count
+    all_threads = sorted({threads for tp, threads in by_tp_threads if tp in ('TCP', 'UDP')})
+    
+    for threads in all_threads:
+        tcp_throughput = by_tp_threads.get(('TCP', threads))
+        udp_throughput = by_tp_threads.get(('UDP', threads))
+        tcp_avg = sum(tcp_throughput) / len(tcp_throughput) if tcp_throughput else 0
+        udp_avg = sum(udp_throughput) / len(udp_throughput) if udp_throughput else 0
+        parts.append(f"| {threads} | {tcp_avg:,.0f} | {udp_avg:,.0f} |\n")
+    
+    parts.append(_FOOTER)
+    
+    return ''.join(parts)
 
 def main():
     parser = argparse.ArgumentParser(description='Compare UVRPC performance test results')
@@ -307,11 +315,19 @@ def main():
     
     args = parser.parse_args()
     
-    # Parse all reports
+    # Parse all reports; they are independent, so many large ones are parsed
+    # in parallel. Typical reports parse in well under a millisecond each.
+    workers = min(os.cpu_count() or 1, len(args.reports))
+    if (len(args.reports) >= _PARALLEL_PARSE_MIN_REPORTS and workers > 1
+            and sum(map(os.path.getsize, args.reports)) >= _PARALLEL_PARSE_MIN_BYTES):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(parse_markdown_report, args.reports))
+    else:
+        parsed = [parse_markdown_report(path) for path in args.reports]
+    
     results_list = []
-    for report_path in args.reports:
+    for report_path, results in zip(args.reports, parsed):
         report_name = Path(report_path).stem
-        results = parse_markdown_report(report_path)
         if results:
             results_list.append((report_name, results))
             print(f"Parsed {len(results)} results from {report_name}")
@@ -327,8 +343,8 @@ def main():
     
     # Output report
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(report)
+        with open(args.output, 'wb', buffering=1 << 16) as f:
+            f.write(report.encode('utf-8'))
         print(f"Report saved to: {args.output}")
     else:
         print(report)
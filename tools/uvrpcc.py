@@ -4,24 +4,52 @@ UVRPC DSL Code Generator with bundled FlatCC
 Generates RPC server stubs and client code from FlatBuffers RPC DSL
 """
 
+import codecs
+import functools
+import io
+import mmap
 import os
 import sys
 import re
+import stat
 import argparse
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-try:
-    from jinja2 import Environment, FileSystemLoader
-except ImportError:
-    print("Error: jinja2 is required. Install with: pip install jinja2")
-    sys.exit(1)
+# Map FlatBuffers types to C types
+_TYPE_MAP = {
+    'int32': 'int32_t',
+    'int64': 'int64_t',
+    'uint32': 'uint32_t',
+    'uint64': 'uint64_t',
+    'float': 'float',
+    'double': 'double',
+    'bool': 'bool',
+    'string': 'const char*',
+    'ubyte': 'uint8_t',
+    'byte': 'int8_t',
+}
+
+# Per-service outputs: (template, generated filename suffix)
+_RPC_OUTPUTS = (
+    ('api.h.j2', 'api.h'),
+    ('rpc_common.h.j2', 'rpc_common.h'),
+    ('server_stub.c.j2', 'server_stub.c'),
+    ('client.c.j2', 'client.c'),
+    ('rpc_common.c.j2', 'rpc_common.c'),
+)
+_BROADCAST_OUTPUTS = (
+    ('broadcast_api.h.j2', 'api.h'),
+    ('broadcast_publisher.c.j2', 'broadcast_publisher.c'),
+    ('broadcast_subscriber.c.j2', 'broadcast_subscriber.c'),
+)
 
 # Try to find bundled flatcc
 BUNDLED_FLATCC = None
 
+@functools.lru_cache(maxsize=1)
 def find_bundled_flatcc():
-    """Find bundled flatcc executable"""
+    """Find bundled flatcc executable (looked up once per process)"""
     global BUNDLED_FLATCC
     
     # Check if running from PyInstaller bundle
@@ -35,7 +63,12 @@ def find_bundled_flatcc():
                 os.path.join(bundle_dir, 'flatcc', 'flatcc'),
             ]
             for flatcc_path in flatcc_paths:
-                if os.path.exists(flatcc_path) and os.access(flatcc_path, os.X_OK):
+                # One stat per candidate; a bundled 'flatcc' directory is skipped
+                try:
+                    st = os.stat(flatcc_path)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode) and st.st_mode & 0o111:
                     BUNDLED_FLATCC = flatcc_path
                     return flatcc_path
     
@@ -44,6 +77,12 @@ def find_bundled_flatcc():
 class RPCParser:
     """Parse FlatBuffers RPC DSL"""
     
+    # FlatBuffers RPC DSL patterns, compiled once for all parser instances
+    # Top-level statement, one match per line: either "namespace name;" or a
+    # block header "table Name {" / "rpc_service Name {" (brace may be on the next line).
+    # Matched against the raw mmapped bytes of the schema.
+    _TOP_RE = re.compile(rb'namespace\s+(\w+);|(table|rpc_service)\s+(\w+)\s*(\{|$)')
+    
     def __init__(self, schema_file):
         self.schema_file = schema_file
         self.namespace = ""
@@ -53,45 +92,100 @@ class RPCParser:
         self.schema_basename = Path(schema_file).stem
         
     def parse(self):
-        """Parse the schema file"""
-        with open(self.schema_file, 'r') as f:
-            content = f.read()
+        """Parse the schema file in a single streaming pass over its mmapped bytes"""
+        block = None        # b'table' or b'rpc_service' while inside a block
+        block_name = None
+        block_open = False  # True once the block's '{' has been seen
+        body = []
+        service_bodies = []
         
-        # Extract namespace
-        ns_match = re.search(r'namespace\s+(\w+);', content)
-        if ns_match:
-            self.namespace = ns_match.group(1)
-        
-        # Extract tables
-        table_pattern = r'table\s+(\w+)\s*\{([^}]+)\}'
-        for match in re.finditer(table_pattern, content, re.DOTALL):
-            table_name = match.group(1)
-            fields_str = match.group(2)
-            fields = self._parse_fields(fields_str)
-            self.tables[table_name] = fields
+        with open(self.schema_file, 'rb') as f:
+            # Only non-empty regular files can be mapped; pipes and FIFOs
+            # (e.g. <(cat schema.fbs)) report size 0 and are read instead
+            st = os.fstat(f.fileno())
+            if stat.S_ISREG(st.st_mode) and st.st_size:
+                schema = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                schema = io.BytesIO(f.read())
+            
+            with schema:
+                # Statements are matched at the start of a line, so a UTF-8
+                # byte order mark must not be left in front of the first one
+                if schema.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+                    schema.seek(0)
+                
+                for line in iter(schema.readline, b''):
+                    # A line may close one block and open the next
+                    while line:
+                        if block is None:
+                            # Only leading whitespace is dropped: the rest of
+                            # the line keeps its newline, which separates
+                            # fields and methods inside a block body
+                            stripped = line.lstrip()
+                            top_match = self._TOP_RE.match(stripped)
+                            if not top_match:
+                                break
+                            line = stripped[top_match.end():]
+                        
+                            # Extract namespace; more statements may follow it
+                            if top_match.group(1):
+                                if not self.namespace:
+                                    self.namespace = top_match.group(1).decode('ascii')
+                                continue
+                        
+                            # Start of a table or rpc_service definition
+                            block, block_name = top_match.group(2), top_match.group(3).decode('ascii')
+                            block_open = top_match.group(4) == b'{'
+                    
+                        if not block_open:
+                            start = line.find(b'{')
+                            if start < 0:
+                                break
+                            line = line[start + 1:]
+                            block_open = True
+                    
+                        end = line.find(b'}')
+                        if end < 0:
+                            body.append(line)
+                            break
+                        body.append(line[:end])
+                    
+                        # Only block bodies are decoded; everything else stays bytes
+                        if block == b'table':
+                            self.tables[block_name] = self._parse_fields(b''.join(body).decode('utf-8'))
+                        else:
+                            service_bodies.append((block_name, b''.join(body).decode('utf-8')))
+                        block = None
+                        body = []
+                        line = line[end + 1:]
         
-        # Extract rpc_service definitions (standard FlatBuffers syntax)
-        service_pattern = r'rpc_service\s+(\w+)\s*\{([^}]+)\}'
-        for match in re.finditer(service_pattern, content, re.DOTALL):
-            service_name = match.group(1)
-            methods_str = match.group(2)
+        # Extract rpc_service definitions (standard FlatBuffers syntax) once
+        # all tables are known, since methods look up their request tables
+        for service_name, methods_str in service_bodies:
             methods = self._parse_methods(methods_str)
             self.services.append({
                 'name': service_name,
+                'name_lower': service_name.lower(),
+                'name_upper': service_name.upper(),
                 'methods': methods
             })
         
         return {
             'namespace': self.namespace,
+            'ns_lower': self.namespace.lower(),
             'schema_basename': self.schema_basename,
             'services': self.services,
+            # Services split by generation mode, decided once here
+            'rpc_services': [s for s in self.services if 'Broadcast' not in s['name']],
+            'broadcast_services': [s for s in self.services if 'Broadcast' in s['name']],
             'tables': self.tables
         }
     
     def _parse_fields(self, fields_str):
         """Parse table fields"""
         fields = []
-        for line in fields_str.split('\n'):
+        fields_append = fields.append
+        for line in fields_str.splitlines():
             line = line.strip()
             if not line or line.startswith('//'):
                 continue
@@ -101,31 +195,12 @@ class RPCParser:
                 field_name = parts[0].strip()
                 field_type = parts[1].strip().rstrip(';')
                 
-                # Map FlatBuffers types to C types
-                type_mapping = {
-                    'int32': 'int32_t',
-                    'int64': 'int64_t',
-                    'uint32': 'uint32_t',
-                    'uint64': 'uint64_t',
-                    'float': 'float',
-                    'double': 'double',
-                    'bool': 'bool',
-                    'string': 'const char*',
-                    'ubyte': 'uint8_t',
-                    'byte': 'int8_t',
-                }
-                
                 # Handle array types like [ubyte]
-                is_array = False
-                c_type = field_type
-                if field_type.startswith('[') and field_type.endswith(']'):
-                    is_array = True
-                    base_type = field_type[1:-1]
-                    c_type = type_mapping.get(base_type, base_type)
-                else:
-                    c_type = type_mapping.get(field_type, field_type)
+                is_array = field_type[:1] == '[' and field_type[-1:] == ']'
+                base_type = field_type[1:-1] if is_array else field_type
+                c_type = _TYPE_MAP.get(base_type, base_type)
                 
-                fields.append({
+                fields_append({
                     'name': field_name,
                     'type': c_type,
                     'original_type': field_type,
@@ -136,22 +211,21 @@ class RPCParser:
     def _parse_methods(self, methods_str):
         """Parse RPC methods"""
         methods = []
-        for line in methods_str.split('\n'):
+        methods_append = methods.append
+        for line in methods_str.splitlines():
             line = line.strip()
             if not line or line.startswith('//'):
                 continue
             # Parse: MethodName(RequestType):ReturnType;
             # Format: Add(BenchmarkAddRequest):BenchmarkAddResponse;
-            match = re.match(r'(\w+)\s*\(\s*(\w+)\s*\)\s*:\s*(\w+)', line)
-            if match:
-                method_name = match.group(1)
-                request_type = match.group(2)
-                return_type = match.group(3)
+            parsed = self._split_method(line)
+            if parsed:
+                method_name, request_type, return_type = parsed
                 
                 # Get request fields from tables
                 request_fields = self.tables.get(request_type, [])
                 
-                methods.append({
+                methods_append({
                     'name': method_name,
                     'return': return_type,
                     'request': request_type,
@@ -159,172 +233,227 @@ class RPCParser:
                     'request_fields': request_fields
                 })
         return methods
+    
+    @staticmethod
+    def _split_method(line):
+        """Split "Name(Request):Return;" into its three names, or None if malformed"""
+        method_name, sep, rest = line.partition('(')
+        if not sep:
+            return None
+        request_type, sep, rest = rest.partition(')')
+        if not sep:
+            return None
+        between, sep, rest = rest.partition(':')
+        if not sep or between.strip():
+            return None
+        # The return type ends at ';' or at trailing attributes like "(streaming: ...)"
+        return_type = rest.partition(';')[0].partition('(')[0].split(None, 1)
+        if not return_type:
+            return None
+        
+        names = (method_name.rstrip(), request_type.strip(), return_type[0])
+        if not all(name.isidentifier() for name in names):
+            return None
+        return names
+
+# Largest batch of generated files flush() writes without a thread pool
+_INLINE_WRITE_MAX = 64
+
+# Raw-write flags for generated files (O_BINARY only exists on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+def _write_file(path, data):
+    """Write encoded generated code to path with raw os.write calls"""
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _write_if_changed(path, data):
+    """Write data to path unless the file already holds exactly those bytes
+    
+    Leaving identical files untouched keeps their mtime, so make/ninja don't
+    rebuild everything after a regeneration. Returns True if path was written.
+    """
+    try:
+        # A size mismatch settles it without reading the old contents
+        if os.stat(path).st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    _write_file(path, data)
+    return True
 
 class RPCGenerator:
-    """Generate RPC code from parsed schema"""
+    """Generate RPC code from parsed schema
+    
+    The generate_* methods only render; call flush() to write the files.
+    """
     
     def __init__(self, output_dir, template_dir):
+        # Imported here so --help and schema parsing don't pay for Jinja2
+        try:
+            from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader
+        except ImportError:
+            print("Error: jinja2 is required. Install with: pip install jinja2")
+            sys.exit(1)
+        
         self.output_dir = Path(output_dir)
+        # Plain string form for building output paths without Path objects
+        self._out = os.fspath(self.output_dir)
         self.template_dir = Path(template_dir)
-        self.env = Environment(loader=FileSystemLoader(str(self.template_dir)))
+        self.env = Environment(
+            loader=FunctionLoader(self._read_template),
+            cache_size=-1,
+            auto_reload=False,
+            # Compiled template code is kept on disk so later runs skip
+            # Jinja2's parse/compile step; entries are keyed by source
+            # checksum. Jinja2 picks a private per-user directory (0700,
+            # ownership checked), since the cache is unmarshalled as code.
+            bytecode_cache=FileSystemBytecodeCache(pattern='__jinja2_%s.cache'),
+        )
+        # Rendered (path, bytes) pairs waiting for flush()
+        self._pending = []
+        # Paths written so far, reported once generation is done
+        self.generated = []
+        # Compiled templates, loaded on first use and shared by all generators.
+        # Only the templates a schema needs are loaded, so a template directory
+        # without e.g. the broadcast templates still works for RPC-only schemas
+        self._templates = {}
+    
+    def generate_all(self, rpc_data):
+        """Render all files for every service in a single pass
+        
+        Services with "Broadcast" in their name get broadcast API, publisher
+        and subscriber code; all others get server/client code.
+        """
+        self._generate(rpc_data, rpc_data['rpc_services'], _RPC_OUTPUTS)
+        self._generate(rpc_data, rpc_data['broadcast_services'], _BROADCAST_OUTPUTS)
+    
+    def flush(self):
+        """Write all rendered files as one batch, skipping unchanged ones
+        
+        Small batches are written inline: starting a thread pool costs more
+        than a few dozen page-cache writes. Larger batches overlap their I/O
+        on a thread pool.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        if len(pending) <= _INLINE_WRITE_MAX:
+            for path, data in pending:
+                _write_if_changed(path, data)
+        else:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(executor.map(lambda item: _write_if_changed(*item), pending))
+        self.generated.extend(path for path, _ in pending)
+    
+    def flush_archive(self, archive_path):
+        """Write all rendered files into one tar archive instead of the output directory
+        
+        Members are named after the generated files and written back to back
+        through a single file object. They carry no timestamp or owner, so
+        identical schemas produce identical archives.
+        """
+        import tarfile
+        
+        pending, self._pending = self._pending, []
+        with tarfile.open(archive_path, 'w', format=tarfile.PAX_FORMAT) as archive:
+            for path, data in pending:
+                info = tarfile.TarInfo(os.path.basename(path))
+                info.size = len(data)
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+        self.generated.append(os.fspath(archive_path))
+    
+    def _generate(self, rpc_data, services, outputs):
+        """Render the given outputs for each of the given services"""
+        if services is None:
+            services = rpc_data['services']
+        for service in services:
+            self._pending.extend(self._render(rpc_data, service, outputs))
+    
+    def _read_template(self, name):
+        """Read a template source once, with no stat or freshness check"""
+        try:
+            return (self.template_dir / name).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None  # Reported by Jinja2 as TemplateNotFound
+    
+    def _template(self, name):
+        """Compiled template by name, loaded on first use"""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+    
+    def _render(self, rpc_data, service, outputs):
+        """Render (template, suffix) outputs for one service as (path, bytes) pairs"""
+        # One template context and one path stem per service, shared by all outputs
+        service_data = {
+            'namespace': rpc_data['namespace'],
+            'schema_basename': rpc_data['schema_basename'],
+            'service': service,
+            'service_name_lower': service['name_lower'],
+            'service_name_upper': service['name_upper'],
+        }
+        stem = os.path.join(self._out, f"{rpc_data['ns_lower']}_{service['name_lower']}_")
         
-    def generate_server_stub(self, rpc_data):
+        # Render to bytes rather than streaming with Template.stream().dump():
+        # generated files are a few KB each, and flush() needs the complete
+        # output to batch the writes
+        return [
+            (stem + suffix, self._template(template_name).render(service_data).encode('utf-8'))
+            for template_name, suffix in outputs
+        ]
+    
+    def generate_server_stub(self, rpc_data, services=None):
         """Generate server stub code - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('server_stub.c.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_server_stub.c".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('server_stub.c.j2', 'server_stub.c'),))
     
-    def generate_client_code(self, rpc_data):
+    def generate_client_code(self, rpc_data, services=None):
         """Generate client code - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('client.c.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_client.c".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('client.c.j2', 'client.c'),))
     
-    def generate_header(self, rpc_data):
+    def generate_header(self, rpc_data, services=None):
         """Generate header file - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('api.h.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_api.h".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('api.h.j2', 'api.h'),))
     
-    def generate_common_header(self, rpc_data):
+    def generate_common_header(self, rpc_data, services=None):
         """Generate common header file - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('rpc_common.h.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_rpc_common.h".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('rpc_common.h.j2', 'rpc_common.h'),))
     
-    def generate_common_code(self, rpc_data):
+    def generate_common_code(self, rpc_data, services=None):
         """Generate common code file - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('rpc_common.c.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_rpc_common.c".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('rpc_common.c.j2', 'rpc_common.c'),))
 
-    def generate_broadcast_api(self, rpc_data):
+    def generate_broadcast_api(self, rpc_data, services=None):
         """Generate broadcast API header - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('broadcast_api.h.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_api.h".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('broadcast_api.h.j2', 'api.h'),))
 
-    def generate_broadcast_publisher(self, rpc_data):
+    def generate_broadcast_publisher(self, rpc_data, services=None):
         """Generate broadcast publisher code - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('broadcast_publisher.c.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_broadcast_publisher.c".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('broadcast_publisher.c.j2', 'broadcast_publisher.c'),))
     
-    def generate_broadcast_subscriber(self, rpc_data):
+    def generate_broadcast_subscriber(self, rpc_data, services=None):
         """Generate broadcast subscriber code - one per service"""
-        for service in rpc_data['services']:
-            service_data = {
-                'namespace': rpc_data['namespace'],
-                'schema_basename': rpc_data['schema_basename'],
-                'service': service,
-                'service_name_lower': service['name'].lower(),
-                'service_name_upper': service['name'].upper(),
-            }
-            
-            template = self.env.get_template('broadcast_subscriber.c.j2')
-            output = template.render(**service_data)
-            
-            filename = "{}_{}_broadcast_subscriber.c".format(rpc_data['namespace'].lower(), service['name'].lower())
-            output_path = self.output_dir / filename
-            output_path.write_text(output)
-            print("Generated: {}".format(output_path))
+        self._generate(rpc_data, services, (('broadcast_subscriber.c.j2', 'broadcast_subscriber.c'),))
 
 def main():
+    import shutil
+    import subprocess
+    
     parser = argparse.ArgumentParser(description='UVRPC DSL Code Generator')
     parser.add_argument('--flatcc', help='Path to flatcc compiler (auto-detected if not specified)')
     parser.add_argument('-o', '--output', default='generated', help='Output directory')
     parser.add_argument('-t', '--templates', default='tools/templates', help='Templates directory')
+    parser.add_argument('--archive', help='Write the generated RPC code into this tar file instead of the output directory')
     parser.add_argument('schema', help='Schema file to process')
     
     args = parser.parse_args()
@@ -340,7 +469,7 @@ def main():
     
     print("Found {} services:".format(len(rpc_data['services'])))
     for service in rpc_data['services']:
-        print("  - {}: {} methods".format(service['name'], len(service['methods'])))
+        print(f"  - {service['name']}: {len(service['methods'])} methods")
     
     # Determine flatcc path
     flatcc_path = args.flatcc
@@ -363,39 +492,44 @@ def main():
         print("For bundled version, ensure flatcc was packaged correctly")
         sys.exit(1)
     
-    # Generate FlatBuffers code
+    # Created before flatcc starts, so a missing jinja2 fails fast
+    generator = RPCGenerator(args.output, args.templates)
+    
+    # Generate FlatBuffers code in the background while templates render
     print("\nGenerating FlatBuffers code with flatcc...")
-    result = subprocess.run(
+    flatcc = subprocess.Popen(
         [flatcc_path, '-c', '-w', '-o', args.output, args.schema],
-        capture_output=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True
     )
     
-    if result.returncode != 0:
-        print("FlatCC error: {}".format(result.stderr))
+    try:
+        # Generate RPC code
+        print("\nGenerating RPC code with Jinja2...")
+        generator.generate_all(rpc_data)
+        
+        # Only write the rendered files once flatcc has succeeded
+        _, flatcc_errors = flatcc.communicate()
+    except BaseException:
+        # Don't leave flatcc writing into the output directory after a failure
+        flatcc.kill()
+        flatcc.wait()
+        raise
+    
+    if flatcc.returncode != 0:
+        print("FlatCC error: {}".format(flatcc_errors))
         return 1
     
-    # Generate RPC code
-    print("\nGenerating RPC code with Jinja2...")
-    generator = RPCGenerator(args.output, args.templates)
-    
-    for service in rpc_data['services']:
-        if 'Broadcast' in service['name']:
-            # Broadcast mode
-            generator.generate_broadcast_api(rpc_data)
-            generator.generate_broadcast_publisher(rpc_data)
-            generator.generate_broadcast_subscriber(rpc_data)
-        else:
-            # Server/Client mode
-            generator.generate_header(rpc_data)
-            generator.generate_common_header(rpc_data)
-            generator.generate_server_stub(rpc_data)
-            generator.generate_client_code(rpc_data)
-            generator.generate_common_code(rpc_data)
+    if args.archive:
+        generator.flush_archive(args.archive)
+    else:
+        generator.flush()
     
+    if generator.generated:
+        print("\n".join(f"Generated: {path}" for path in generator.generated))
     print("\nCode generation complete!")
     return 0
 
 if __name__ == '__main__':
-    import shutil
     sys.exit(main())
\ No newline at end of file